@@ -45,6 +45,15 @@ class TaskQueueDB:
                     ''')
                     # 索引优化：加快 get_pending_task 的速度
                     conn.execute("CREATE INDEX IF NOT EXISTS idx_task_status_time ON tasks (status, next_retry_at)")
+                    # 文件最后一次同步成功时的状态：用于快速指纹比对，避免重复计算完整 MD5
+                    conn.execute('''
+                        CREATE TABLE IF NOT EXISTS file_states (
+                            local_path TEXT PRIMARY KEY,                        -- 本地文件绝对路径
+                            fingerprint TEXT,                                   -- 快速指纹（大小 + 采样块 CRC32）
+                            md5 TEXT,                                           -- 完整 MD5
+                            synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP       -- 同步时间
+                        )
+                    ''')
             finally:
                 conn.close()
 
@@ -120,4 +129,54 @@ class TaskQueueDB:
             except Exception as e:
                 logger.error(f"❌ 标记失败记录异常: {e}")
             finally:
-                conn.close()
\ No newline at end of file
+                conn.close()
+
+    # === 文件同步状态 (快速指纹) ===
+
+    def get_file_state(self, local_path):
+        with self.lock:
+            conn = self._get_conn()
+            try:
+                cursor = conn.execute(
+                    "SELECT fingerprint, md5 FROM file_states WHERE local_path=?", (str(local_path),)
+                )
+                row = cursor.fetchone()
+                return dict(row) if row else None
+            finally:
+                conn.close()
+
+    def save_file_state(self, local_path, fingerprint, md5):
+        if not fingerprint: return
+        with self.lock:
+            conn = self._get_conn()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO file_states (local_path, fingerprint, md5, synced_at) VALUES (?, ?, ?, CURRENT_TIMESTAMP)",
+                        (str(local_path), fingerprint, md5)
+                    )
+            except Exception as e:
+                logger.error(f"DB Save State Error: {e}")
+            finally:
+                conn.close()
+
+    def clear_file_state(self, local_path):
+        '''文件/目录被删除或移动后清除记录，避免同内容重建时被误判为未变化
+        不依赖 is_directory：Windows 下目录删除 (如移入回收站) 可能被报告为文件删除，
+        因此总是同时清除该路径本身及其下所有子路径'''
+        with self.lock:
+            conn = self._get_conn()
+            try:
+                with conn:
+                    path = str(local_path).rstrip("/\\")
+                    # 前缀范围查询 [path + sep, path + chr(sep + 1))，可走主键索引
+                    lower = path + os.sep
+                    upper = path + chr(ord(os.sep) + 1)
+                    conn.execute(
+                        "DELETE FROM file_states WHERE local_path=? OR (local_path >= ? AND local_path < ?)",
+                        (path, lower, upper)
+                    )
+            except Exception as e:
+                logger.error(f"DB Clear State Error: {e}")
+            finally:
+                conn.close()
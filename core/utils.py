@@ -1,4 +1,5 @@
 import os
+import zlib
 import hashlib
 import logging
 
@@ -37,6 +38,34 @@ def calc_md5(path):
         logger.debug(f"MD5 Calculation failed for {path}: {e}")
         return None
 
+def calc_fast_fingerprint(path, sample_size=65536, sample_stride=1048576, max_samples=512, full_limit=4194304):
+    '''快速指纹：用于在完整 MD5 之前判断内容是否可能变化
+    - 小文件 (<= full_limit)：直接计算完整 MD5 作为指纹，只读一遍且精确
+    - 大文件：文件大小 + 按步长均匀分布的采样块 (含头尾) 的 CRC32，采样数随文件大小增长
+    注意：大文件指纹是抽样的，同大小且仅改动采样块之外字节的修改无法识别，需通过 tools_scan 全量校验兜底
+    返回 (fingerprint, 实际读取字节数, md5)，md5 仅小文件时有值；失败返回 (None, 0, None)'''
+    try:
+        size = os.path.getsize(path)
+        if size <= full_limit:
+            md5 = calc_md5(path)
+            if not md5: return None, 0, None
+            return f"{size}:md5:{md5}", size, md5
+
+        n = min(max(3, size // sample_stride), max_samples)
+        step = (size - sample_size) / (n - 1)
+        crc = 0
+        read_bytes = 0
+        with open(path, "rb") as f:
+            for i in range(n):
+                f.seek(int(i * step))
+                block = f.read(sample_size)
+                read_bytes += len(block)
+                crc = zlib.crc32(block, crc)
+        return f"{size}:crc:{n}:{crc:08x}", read_bytes, None
+    except Exception as e:
+        logger.debug(f"Fingerprint failed for {path}: {e}")
+        return None, 0, None
+
 def get_rel_path(path, base_dir):
     '''统一相对路径分隔符为 /'''
     try:
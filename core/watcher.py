@@ -4,7 +4,7 @@ import uuid
 import threading
 import logging
 from watchdog.events import FileSystemEventHandler
-from .utils import is_placeholder, should_ignore, calc_md5, get_rel_path
+from .utils import is_placeholder, should_ignore, calc_md5, calc_fast_fingerprint, get_rel_path
 import client_settings as settings
 
 logger = logging.getLogger("Watcher")
@@ -41,6 +41,8 @@ class LabFileHandler(FileSystemEventHandler):
         self.db = db
         self.machine_id = settings.INSTRUMENT_ALIAS
         self.debouncer = DebounceScanner(self)
+        # 哈希 I/O 统计：快速指纹命中后跳过的完整 MD5 次数与字节数
+        self.hash_stats = {"full_md5": 0, "full_bytes": 0, "skipped": 0, "skipped_bytes": 0, "sample_bytes": 0}
         threading.Thread(target=self.debouncer.run, daemon=True).start()
 
     def _audit(self, event_type, path, old_path=None):
@@ -68,10 +70,40 @@ class LabFileHandler(FileSystemEventHandler):
             return
         except: return
 
-        md5 = calc_md5(path)
+        # 第一层：快速指纹，与上次同步成功时一致则内容未变，跳过完整 MD5
+        # 小文件的指纹本身就是完整 MD5，此时 md5 直接复用，不再重复读取
+        fingerprint, read_bytes, md5 = calc_fast_fingerprint(path)
+        if md5:
+            self.hash_stats["full_md5"] += 1
+            self.hash_stats["full_bytes"] += read_bytes
+        else:
+            self.hash_stats["sample_bytes"] += read_bytes
+        if fingerprint:
+            state = self.db.get_file_state(path)
+            if state and state["fingerprint"] == fingerprint:
+                self.hash_stats["skipped"] += 1
+                if not md5:
+                    self.hash_stats["skipped_bytes"] += int(fingerprint.split(":", 1)[0])
+                logger.info(f"⏭️ 内容未变化，跳过: {rel} {self._hash_stats_summary()}")
+                return
+
+        # 第二层：完整 MD5
+        if not md5:
+            md5 = calc_md5(path)
+            if md5:
+                self.hash_stats["full_md5"] += 1
+                self.hash_stats["full_bytes"] += os.path.getsize(path)
         mtime = os.path.getmtime(path)
         if md5:
-            self.db.add_task("UPLOAD", path, rel, extra_data={"md5": md5, "mtime": mtime})
+            self.db.add_task("UPLOAD", path, rel, extra_data={"md5": md5, "mtime": mtime, "fingerprint": fingerprint})
+
+    def _hash_stats_summary(self):
+        '''净节省 = 跳过的完整 MD5 字节数 - 全部采样读取字节数 (含未命中)'''
+        st = self.hash_stats
+        mb = 1024 * 1024
+        net = st["skipped_bytes"] - st["sample_bytes"]
+        return (f"(累计跳过 {st['skipped']} 次, 完整MD5 {st['full_md5']} 次/{st['full_bytes']/mb:.2f}MB, "
+                f"采样 {st['sample_bytes']/mb:.2f}MB, 净节省读取 {net/mb:.2f}MB)")
 
     def on_created(self, event):
         if should_ignore(event.src_path): return
@@ -103,6 +135,9 @@ class LabFileHandler(FileSystemEventHandler):
         old_rel = get_rel_path(event.src_path, settings.WATCH_DIR)
         new_rel = get_rel_path(event.dest_path, settings.WATCH_DIR)
         if old_rel and new_rel:
+            # 覆盖移动时目标原有记录同样失效
+            self.db.clear_file_state(event.src_path)
+            self.db.clear_file_state(event.dest_path)
             self.db.add_task("RENAME", "", old_rel, extra_data={"new_path": new_rel})
             self._audit("MOVED", event.dest_path, old_path=event.src_path)
 
@@ -110,5 +145,6 @@ class LabFileHandler(FileSystemEventHandler):
         if should_ignore(event.src_path): return
         rel = get_rel_path(event.src_path, settings.WATCH_DIR)
         if rel:
+            self.db.clear_file_state(event.src_path)
             self.db.add_task("DELETE", "", rel, extra_data={"is_dir": event.is_directory})
             self._audit("DELETED", event.src_path)
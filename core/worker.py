@@ -3,6 +3,7 @@ import json
 import logging
 import os
 from .api import LabClientAPI
+from .utils import calc_fast_fingerprint
 
 logger = logging.getLogger("Worker")
 
@@ -62,6 +63,14 @@ def start_sync_worker(db):
 
         if success:
             db.mark_done(tid)
+            if action == "UPLOAD":
+                # 记录同步成功时的快速指纹，后续相同内容的重写可跳过完整 MD5
+                # 上传读取的是当前文件，仅当当前指纹与入列时一致才可信，否则清除旧记录
+                fingerprint, _, _ = calc_fast_fingerprint(local)
+                if fingerprint and fingerprint == extra.get('fingerprint'):
+                    db.save_file_state(local, fingerprint, extra.get('md5'))
+                else:
+                    db.clear_file_state(local)
             logger.info(f"✅ 完成: {action} {rel}")
         else:
             db.mark_failed(tid)
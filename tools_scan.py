@@ -3,7 +3,7 @@ import logging
 import client_settings as settings
 from core.database import TaskQueueDB
 from core.api import LabClientAPI
-from core.utils import should_ignore, is_placeholder, calc_md5, get_rel_path
+from core.utils import should_ignore, is_placeholder, calc_md5, calc_fast_fingerprint, get_rel_path
 
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger("Tool")
@@ -28,7 +28,9 @@ def run_scan():
             
             try:
                 rel = get_rel_path(path, settings.WATCH_DIR)
-                md5 = calc_md5(path)
+                # 指纹须在 MD5 之前计算，保证记录的指纹不会比 MD5 对应的内容更新
+                fingerprint, _, md5 = calc_fast_fingerprint(path)
+                if not md5: md5 = calc_md5(path)
                 mtime = os.path.getmtime(path)
                 
                 # 校验完整性 (Check Integrity)
@@ -39,7 +41,13 @@ def run_scan():
                 
                 if status != "MATCH":
                     print(f"👉 发现差异: {rel} [{status}]")
-                    db.add_task("UPLOAD", path, rel, extra_data={"md5": md5, "mtime": mtime})
+                    db.add_task("UPLOAD", path, rel, extra_data={"md5": md5, "mtime": mtime, "fingerprint": fingerprint})
+                else:
+                    # 服务器已一致：记录同步状态，供监听端快速指纹比对
+                    # 校验期间文件若被改写则不记录，交由监听端重新处理
+                    current, _, _ = calc_fast_fingerprint(path)
+                    if fingerprint and current == fingerprint:
+                        db.save_file_state(path, fingerprint, md5)
                     
             except Exception as e:
                 print(f"❌ 扫描错误 {name}: {e}")